@@ -0,0 +1,8 @@
+from infi.clickhouse_orm import migrations
+
+from ee.clickhouse.sql.events_retention import EVENTS_RETENTION_TABLE_MV_SQL, EVENTS_RETENTION_TABLE_SQL
+
+operations = [
+    migrations.RunSQL(EVENTS_RETENTION_TABLE_SQL),
+    migrations.RunSQL(EVENTS_RETENTION_TABLE_MV_SQL),
+]
@@ -15,6 +15,7 @@ from ee.clickhouse.sql.person import (
     DELETE_PERSON_BY_ID,
     DELETE_PERSON_DISTINCT_ID_BY_PERSON_ID,
     DELETE_PERSON_EVENTS_BY_ID,
+    DELETE_PERSON_EVENTS_RETENTION_BY_ID,
     GET_PERSON_BY_DISTINCT_ID,
     GET_PERSON_IDS_BY_FILTER,
     INSERT_PERSON_DISTINCT_ID,
@@ -115,6 +116,7 @@ def delete_person(
     try:
         if delete_events:
             sync_execute(DELETE_PERSON_EVENTS_BY_ID, {"id": person_id, "team_id": team_id})
+            sync_execute(DELETE_PERSON_EVENTS_RETENTION_BY_ID, {"id": person_id, "team_id": team_id})
     except:
         pass  # cannot delete if the table is distributed
 
@@ -1,5 +1,6 @@
 from typing import Any, Dict, Tuple
 
+from django.conf import settings
 from django.db.models.query import Prefetch
 
 from ee.clickhouse.client import sync_execute
@@ -17,10 +18,13 @@ from ee.clickhouse.sql.retention.people_in_period import (
 )
 from ee.clickhouse.sql.retention.retention import (
     INITIAL_INTERVAL_SQL,
+    REFERENCE_EVENT_MV_SQL,
     REFERENCE_EVENT_SQL,
+    REFERENCE_EVENT_UNIQUE_MV_SQL,
     REFERENCE_EVENT_UNIQUE_SQL,
     RETENTION_PEOPLE_SQL,
     RETENTION_SQL,
+    RETENTION_SQL_MV,
 )
 from posthog.constants import RETENTION_FIRST_TIME, TREND_FILTER_TYPE_ACTIONS, TREND_FILTER_TYPE_EVENTS, TRENDS_LINEAR
 from posthog.models.action import Action
@@ -30,6 +34,13 @@ from posthog.models.person import Person
 from posthog.models.team import Team
 from posthog.queries.retention import Retention
 
+# Bound memory per query and let large GROUP BYs spill to disk instead of hitting the server memory limit
+RETENTION_QUERY_SETTINGS = {
+    "max_memory_usage": 5_000_000_000,
+    "max_bytes_before_external_group_by": 2_500_000_000,
+    "group_by_two_level_threshold_bytes": 50_000_000,
+}
+
 
 class ClickhouseRetention(Retention):
     def _execute_sql(self, filter: RetentionFilter, team: Team,) -> Dict[Tuple[int, int], Dict[str, Any]]:
@@ -53,28 +64,37 @@ class ClickhouseRetention(Retention):
         target_query_formatted = "AND {target_query}".format(target_query=target_query)
         returning_query_formatted = "AND {returning_query}".format(returning_query=returning_query)
 
-        reference_event_sql = (REFERENCE_EVENT_UNIQUE_SQL if is_first_time_retention else REFERENCE_EVENT_SQL).format(
+        use_materialized_view = self._can_use_materialized_view(filter, prop_filters)
+        if use_materialized_view:
+            retention_sql = RETENTION_SQL_MV
+            reference_sql = REFERENCE_EVENT_UNIQUE_MV_SQL if is_first_time_retention else REFERENCE_EVENT_MV_SQL
+        else:
+            retention_sql = RETENTION_SQL
+            reference_sql = REFERENCE_EVENT_UNIQUE_SQL if is_first_time_retention else REFERENCE_EVENT_SQL
+
+        # Plain event equality is cheap to check before reading the other columns. Action conditions stay in WHERE
+        # as they read the wide properties and elements_chain columns, which would defeat the point of PREWHERE.
+        # RETENTION_SQL_MV reads from events_retention and has no PREWHERE.
+        if use_materialized_view or returning_entity.type == TREND_FILTER_TYPE_ACTIONS:
+            returning_prewhere, returning_where = "", returning_query_formatted
+        else:
+            returning_prewhere, returning_where = returning_query_formatted, ""
+
+        reference_event_sql = reference_sql.format(
             target_query=target_query_formatted,
             filters=prop_filters,
             trunc_func=trunc_func,
             latest_distinct_id_sql=GET_LATEST_PERSON_DISTINCT_ID_SQL,
         )
 
-        target_condition, _ = self._get_condition(target_entity, table="reference_event")
-        if is_first_time_retention:
-            target_condition = target_condition.replace("reference_event.uuid", "reference_event.min_uuid")
-            target_condition = target_condition.replace("reference_event.event", "reference_event.min_event")
-        returning_condition, _ = self._get_condition(returning_entity, table="event", prepend="returning")
         result = sync_execute(
-            RETENTION_SQL.format(
+            retention_sql.format(
                 target_query=target_query_formatted,
-                returning_query=returning_query_formatted,
+                returning_query=returning_where,
+                returning_prewhere=returning_prewhere,
                 filters=prop_filters,
                 trunc_func=trunc_func,
-                extra_union="UNION ALL {} ".format(reference_event_sql),
                 reference_event_sql=reference_event_sql,
-                target_condition=target_condition,
-                returning_condition=returning_condition,
                 latest_distinct_id_sql=GET_LATEST_PERSON_DISTINCT_ID_SQL,
             ),
             {
@@ -96,6 +116,7 @@ class ClickhouseRetention(Retention):
                 **returning_params,
                 "period": period,
             },
+            settings=RETENTION_QUERY_SETTINGS,
         )
 
         initial_interval_result = sync_execute(
@@ -123,17 +144,31 @@ class ClickhouseRetention(Retention):
                 **returning_params,
                 "period": period,
             },
+            settings=RETENTION_QUERY_SETTINGS,
         )
 
         result_dict = {}
         for initial_res in initial_interval_result:
             result_dict.update({(initial_res[0], 0): {"count": initial_res[1], "people": []}})
 
-        for res in result:
-            result_dict.update({(res[0], res[1]): {"count": res[2], "people": []}})
+        # Each row holds one base interval with its (intervals_from_base, count) pairs already sorted
+        for base_interval, values in result:
+            for intervals_from_base, count in values:
+                result_dict[(base_interval, intervals_from_base)] = {"count": count, "people": []}
 
         return result_dict
 
+    def _can_use_materialized_view(self, filter: RetentionFilter, prop_filters: str) -> bool:
+        # events_retention only keeps event names and hourly buckets, so actions, property filters and
+        # hourly periods (which aren't aligned to bucket boundaries) still need the raw events table
+        return (
+            settings.CLICKHOUSE_RETENTION_MATERIALIZED_VIEW
+            and filter.period != "Hour"
+            and not prop_filters
+            and filter.target_entity.type != TREND_FILTER_TYPE_ACTIONS
+            and filter.returning_entity.type != TREND_FILTER_TYPE_ACTIONS
+        )
+
     def _get_condition(self, target_entity: Entity, table: str, prepend: str = "") -> Tuple[str, Dict]:
         if target_entity.type == TREND_FILTER_TYPE_ACTIONS:
             action = Action.objects.get(pk=target_entity.id)
@@ -161,6 +196,8 @@ class ClickhouseRetention(Retention):
         return_query, return_params = self._get_condition(returning_entity, table="e", prepend="returning")
         return_query_formatted = "AND {return_query}".format(return_query=return_query)
 
+        # People lookups are paginated to a single cell and always read raw events, events_retention is only used for
+        # the counts in _execute_sql
         reference_event_query = (REFERENCE_EVENT_UNIQUE_SQL if is_first_time_retention else REFERENCE_EVENT_SQL).format(
             target_query=target_query_formatted,
             filters=prop_filters,
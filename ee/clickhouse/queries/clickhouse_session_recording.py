@@ -54,8 +54,8 @@ class SessionRecording(BaseSessionRecording):
     ) -> Tuple[Optional[DistinctId], Optional[datetime.datetime], Snapshots]:
         response = sync_execute(SINGLE_RECORDING_QUERY, {"team_id": team.id, "session_id": session_id})
         if len(response) == 0:
-            return None, None, []
-        return response[0][0], response[0][1], [json.loads(snapshot_data) for _, _, snapshot_data in response]
+            return None, None, iter([])
+        return response[0][0], response[0][1], (json.loads(snapshot_data) for _, _, snapshot_data in response)
 
 
 def filter_sessions_by_recordings(team: Team, sessions_results: List[Any], filter: SessionsFilter) -> List[Any]:
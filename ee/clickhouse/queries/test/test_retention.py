@@ -2,13 +2,15 @@ from datetime import datetime
 from uuid import uuid4
 
 import pytz
+from django.test import override_settings
 
 from ee.clickhouse.models.event import create_event
 from ee.clickhouse.queries.clickhouse_retention import ClickhouseRetention
 from ee.clickhouse.util import ClickhouseTestMixin
+from posthog.constants import RETENTION_FIRST_TIME, RETENTION_TYPE, TRENDS_LINEAR
 from posthog.models.action import Action
 from posthog.models.action_step import ActionStep
-from posthog.models.filters import Filter
+from posthog.models.filters import Filter, RetentionFilter
 from posthog.models.person import Person
 from posthog.queries.test.test_retention import retention_test_factory
 
@@ -33,3 +35,46 @@ def _create_person(**kwargs):
 
 class TestClickhouseRetention(ClickhouseTestMixin, retention_test_factory(ClickhouseRetention, _create_event, _create_person, _create_action)):  # type: ignore
     pass
+
+
+@override_settings(CLICKHOUSE_RETENTION_MATERIALIZED_VIEW=True)
+class TestClickhouseRetentionMaterializedView(ClickhouseTestMixin, retention_test_factory(ClickhouseRetention, _create_event, _create_person, _create_action)):  # type: ignore
+    def test_materialized_view_matches_raw_events_at_end_boundary(self):
+        _create_person(team_id=self.team.pk, distinct_ids=["person1"])
+        _create_person(team_id=self.team.pk, distinct_ids=["person2"])
+        _create_person(team_id=self.team.pk, distinct_ids=["person3"])
+
+        self._create_events(
+            [
+                ("person1", self._date(0)),
+                ("person2", self._date(0)),
+                ("person3", self._date(0)),
+                # The query's end date is date_to plus one period, events_retention buckets each of these pairs into the
+                # hour starting at it: 2020-06-21 for days and 2020-06-27 for weeks
+                ("person1", datetime(2020, 6, 21, 0, tzinfo=pytz.UTC).isoformat()),
+                ("person2", datetime(2020, 6, 21, 0, 30, tzinfo=pytz.UTC).isoformat()),
+                ("person1", datetime(2020, 6, 27, 0, tzinfo=pytz.UTC).isoformat()),
+                ("person2", datetime(2020, 6, 27, 0, 30, tzinfo=pytz.UTC).isoformat()),
+                # and these into the hour starting a day after date_from, the end of the TRENDS_LINEAR reference window
+                ("person1", datetime(2020, 6, 11, 0, 30, tzinfo=pytz.UTC).isoformat()),
+                ("person3", datetime(2020, 6, 11, 0, tzinfo=pytz.UTC).isoformat()),
+            ]
+        )
+
+        # Compare the raw resultsets, the end date falls one interval past what run() keeps in the table
+        results = {}
+        for key, data in [
+            ("day", {"date_to": "2020-06-20"}),
+            ("first_time", {"date_to": "2020-06-20", RETENTION_TYPE: RETENTION_FIRST_TIME}),
+            ("linear", {"date_to": "2020-06-20", "display": TRENDS_LINEAR}),
+            ("week", {"date_to": "2020-06-20", "period": "Week"}),
+        ]:
+            with override_settings(CLICKHOUSE_RETENTION_MATERIALIZED_VIEW=False):
+                expected = ClickhouseRetention()._execute_sql(RetentionFilter(data=data), self.team)
+
+            results[key] = ClickhouseRetention()._execute_sql(RetentionFilter(data=data), self.team)
+            self.assertEqual(results[key], expected)
+
+        # Only the events exactly at the end date count
+        self.assertEqual(results["day"][(0, 11)]["count"], 1)
+        self.assertEqual(results["linear"][(1, 0)]["count"], 1)
@@ -21,6 +21,12 @@ COLLAPSING_TABLE_ENGINE = (
     else "CollapsingMergeTree({ver})"
 )
 
+AGGREGATING_TABLE_ENGINE = (
+    "ReplicatedAggregatingMergeTree('/clickhouse/tables/{{shard}}/posthog.{table}', '{{replica}}')"
+    if CLICKHOUSE_REPLICATION
+    else "AggregatingMergeTree()"
+)
+
 KAFKA_ENGINE = "Kafka('{kafka_host}', '{topic}', '{group}', '{serialization}')"
 
 KAFKA_PROTO_ENGINE = """
@@ -44,6 +50,7 @@ KAFKA_COLUMNS = """
 
 COLLAPSING_MERGE_TREE = "collapsing_merge_tree"
 REPLACING_MERGE_TREE = "replacing_merge_tree"
+AGGREGATING_MERGE_TREE = "aggregating_merge_tree"
 
 
 def table_engine(table: str, ver: Optional[str] = None, engine_type: Optional[str] = None) -> str:
@@ -51,6 +58,8 @@ def table_engine(table: str, ver: Optional[str] = None, engine_type: Optional[st
         return COLLAPSING_TABLE_ENGINE.format(table=table, ver=ver)
     elif engine_type == REPLACING_MERGE_TREE and ver:
         return REPLACING_TABLE_ENGINE.format(table=table, ver=ver)
+    elif engine_type == AGGREGATING_MERGE_TREE:
+        return AGGREGATING_TABLE_ENGINE.format(table=table)
     else:
         return MERGE_TABLE_ENGINE.format(table=table)
 
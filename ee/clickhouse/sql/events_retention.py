@@ -0,0 +1,61 @@
+from .clickhouse import AGGREGATING_MERGE_TREE, STORAGE_POLICY, table_engine
+
+# Pre-aggregates events per (team, event, hour, distinct_id) so retention queries read hourly buckets
+# instead of raw events. Hour is the finest retention period; coarser periods are derived on read
+# by truncating `period` further.
+#
+# NOTE: the materialized view only processes rows inserted after it's created. Existing events need
+# to be backfilled once with `python manage.py backfill_events_retention` before enabling
+# CLICKHOUSE_RETENTION_MATERIALIZED_VIEW.
+
+EVENTS_RETENTION_TABLE = "events_retention"
+
+EVENTS_RETENTION_TABLE_SQL = """
+CREATE TABLE {table_name}
+(
+    team_id Int64,
+    event VARCHAR,
+    distinct_id VARCHAR,
+    period DateTime('UTC'),
+    first_timestamp AggregateFunction(min, DateTime64(6, 'UTC'))
+) ENGINE = {engine}
+PARTITION BY toYYYYMM(period)
+ORDER BY (team_id, event, period, distinct_id)
+{storage_policy}
+""".format(
+    table_name=EVENTS_RETENTION_TABLE,
+    engine=table_engine(EVENTS_RETENTION_TABLE, engine_type=AGGREGATING_MERGE_TREE),
+    storage_policy=STORAGE_POLICY,
+)
+
+EVENTS_RETENTION_SELECT_SQL = """
+SELECT
+team_id,
+event,
+distinct_id,
+toStartOfHour(timestamp) AS period,
+minState(timestamp) AS first_timestamp
+FROM events
+"""
+
+EVENTS_RETENTION_TABLE_MV_SQL = """
+CREATE MATERIALIZED VIEW {table_name}_mv
+TO {table_name}
+AS {select_sql}
+GROUP BY team_id, event, distinct_id, period
+""".format(
+    table_name=EVENTS_RETENTION_TABLE, select_sql=EVENTS_RETENTION_SELECT_SQL
+)
+
+EVENTS_RETENTION_BACKFILL_SQL = """
+INSERT INTO {table_name}
+{select_sql}
+WHERE timestamp < toDateTime(%(before)s)
+GROUP BY team_id, event, distinct_id, period
+""".format(
+    table_name=EVENTS_RETENTION_TABLE, select_sql=EVENTS_RETENTION_SELECT_SQL
+)
+
+DROP_EVENTS_RETENTION_TABLE_MV_SQL = "DROP TABLE events_retention_mv"
+
+DROP_EVENTS_RETENTION_TABLE_SQL = "DROP TABLE events_retention"
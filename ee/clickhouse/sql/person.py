@@ -231,6 +231,14 @@ where distinct_id IN (
 AND team_id = %(team_id)s
 """
 
+DELETE_PERSON_EVENTS_RETENTION_BY_ID = """
+ALTER TABLE events_retention DELETE
+where distinct_id IN (
+    SELECT distinct_id FROM person_distinct_id WHERE person_id=%(id)s AND team_id = %(team_id)s
+)
+AND team_id = %(team_id)s
+"""
+
 DELETE_PERSON_DISTINCT_ID_BY_PERSON_ID = """
 ALTER TABLE person_distinct_id DELETE where person_id = %(id)s
 """
@@ -1,4 +1,8 @@
 RETENTION_SQL = """
+SELECT
+    base_interval,
+    arraySort(x -> x.1, groupArray((intervals_from_base, count))) AS intervals
+FROM (
 SELECT
     datediff(%(period)s, {trunc_func}(toDateTime(%(start_date)s)), reference_event.event_date) as base_interval,
     datediff(%(period)s, reference_event.event_date, {trunc_func}(toDateTime(event_date))) as intervals_from_base,
@@ -9,9 +13,15 @@ FROM (
     pdi.person_id as person_id,
     e.uuid as uuid,
     e.event as event
-    FROM events e join (SELECT person_id, distinct_id FROM ({latest_distinct_id_sql}) WHERE team_id = %(team_id)s) pdi on e.distinct_id = pdi.distinct_id
-    where toDateTime(e.timestamp) >= toDateTime(%(start_date)s) AND toDateTime(e.timestamp) <= toDateTime(%(end_date)s)
-    AND e.team_id = %(team_id)s {returning_query} {filters}
+    FROM (
+        SELECT timestamp, distinct_id, uuid, event
+        FROM events e
+        PREWHERE e.team_id = %(team_id)s
+        AND toDate(e.timestamp) >= toDate(toDateTime(%(start_date)s)) AND toDate(e.timestamp) <= toDate(toDateTime(%(end_date)s))
+        {returning_prewhere}
+        WHERE toDateTime(e.timestamp) >= toDateTime(%(start_date)s) AND toDateTime(e.timestamp) <= toDateTime(%(end_date)s)
+        {returning_query} {filters}
+    ) e join (SELECT person_id, distinct_id FROM ({latest_distinct_id_sql}) WHERE team_id = %(team_id)s) pdi on e.distinct_id = pdi.distinct_id
 ) event
 JOIN (
     {reference_event_sql}
@@ -19,7 +29,9 @@ JOIN (
     ON (event.person_id = reference_event.person_id)
 WHERE {trunc_func}(event.event_date) > {trunc_func}(reference_event.event_date)
 GROUP BY base_interval, intervals_from_base
-ORDER BY base_interval, intervals_from_base
+)
+GROUP BY base_interval
+ORDER BY base_interval
 """
 
 REFERENCE_EVENT_SQL = """
@@ -30,6 +42,7 @@ e.uuid as uuid,
 e.event as event
 from events e JOIN (SELECT person_id, distinct_id FROM ({latest_distinct_id_sql}) WHERE team_id = %(team_id)s) pdi on e.distinct_id = pdi.distinct_id
 where toDateTime(e.timestamp) >= toDateTime(%(reference_start_date)s) AND toDateTime(e.timestamp) <= toDateTime(%(reference_end_date)s)
+AND toDate(e.timestamp) >= toDate(toDateTime(%(reference_start_date)s)) AND toDate(e.timestamp) <= toDate(toDateTime(%(reference_end_date)s))
 AND e.team_id = %(team_id)s {target_query} {filters}
 """
 
@@ -50,6 +63,7 @@ RETENTION_PEOPLE_SQL = """
 SELECT DISTINCT person_id 
 FROM events e join (SELECT person_id, distinct_id FROM ({latest_distinct_id_sql}) WHERE team_id = %(team_id)s) pdi on e.distinct_id = pdi.distinct_id
 where toDateTime(e.timestamp) >= toDateTime(%(start_date)s) AND toDateTime(e.timestamp) <= toDateTime(%(end_date)s)
+AND toDate(e.timestamp) >= toDate(toDateTime(%(start_date)s)) AND toDate(e.timestamp) <= toDate(toDateTime(%(end_date)s))
 AND e.team_id = %(team_id)s AND person_id IN (
     SELECT person_id FROM ({reference_event_query}) as persons
 ) {target_query} {filters}
@@ -62,3 +76,61 @@ SELECT datediff(%(period)s, {trunc_func}(toDateTime(%(start_date)s)), event_date
     {reference_event_sql}
 ) GROUP BY event_date ORDER BY event_date
 """
+
+# Variants of RETENTION_SQL and REFERENCE_EVENT(_UNIQUE)_SQL reading hourly buckets from events_retention,
+# see ee/clickhouse/sql/events_retention.py.
+# Only valid for event (not action) entities without property filters.
+# The raw queries include events up to and including the end date, so the bucket starting at the end date only
+# counts when its earliest event is at or before it. Checking each row's partial min state is enough since any row
+# passing means the merged min passes too.
+RETENTION_SQL_MV = """
+SELECT
+    base_interval,
+    arraySort(x -> x.1, groupArray((intervals_from_base, count))) AS intervals
+FROM (
+SELECT
+    datediff(%(period)s, {trunc_func}(toDateTime(%(start_date)s)), reference_event.event_date) as base_interval,
+    datediff(%(period)s, reference_event.event_date, {trunc_func}(toDateTime(event_date))) as intervals_from_base,
+    COUNT(DISTINCT event.person_id) count
+FROM (
+    SELECT
+    e.period AS event_date,
+    pdi.person_id as person_id,
+    e.event as event
+    FROM events_retention e join (SELECT person_id, distinct_id FROM ({latest_distinct_id_sql}) WHERE team_id = %(team_id)s) pdi on e.distinct_id = pdi.distinct_id
+    where e.period >= toDateTime(%(start_date)s) AND e.period <= toDateTime(%(end_date)s)
+    AND finalizeAggregation(e.first_timestamp) <= toDateTime(%(end_date)s)
+    AND e.team_id = %(team_id)s {returning_query}
+) event
+JOIN (
+    {reference_event_sql}
+) reference_event
+    ON (event.person_id = reference_event.person_id)
+WHERE {trunc_func}(event.event_date) > {trunc_func}(reference_event.event_date)
+GROUP BY base_interval, intervals_from_base
+)
+GROUP BY base_interval
+ORDER BY base_interval
+"""
+
+REFERENCE_EVENT_MV_SQL = """
+SELECT DISTINCT
+{trunc_func}(e.period) as event_date,
+pdi.person_id as person_id,
+e.event as event
+from events_retention e JOIN (SELECT person_id, distinct_id FROM ({latest_distinct_id_sql}) WHERE team_id = %(team_id)s) pdi on e.distinct_id = pdi.distinct_id
+where e.period >= toDateTime(%(reference_start_date)s) AND e.period <= toDateTime(%(reference_end_date)s)
+AND finalizeAggregation(e.first_timestamp) <= toDateTime(%(reference_end_date)s)
+AND e.team_id = %(team_id)s {target_query}
+"""
+
+REFERENCE_EVENT_UNIQUE_MV_SQL = """
+SELECT DISTINCT
+{trunc_func}(minMerge(e.first_timestamp)) as event_date,
+pdi.person_id as person_id,
+argMin(e.event, e.period) as min_event
+from events_retention e JOIN (SELECT person_id, distinct_id FROM ({latest_distinct_id_sql}) WHERE team_id = %(team_id)s) pdi on e.distinct_id = pdi.distinct_id
+WHERE e.team_id = %(team_id)s {target_query}
+GROUP BY person_id HAVING
+event_date >= toDateTime(%(reference_start_date)s) AND event_date <= toDateTime(%(reference_end_date)s)
+"""
@@ -11,6 +11,12 @@ from ee.clickhouse.sql.events import (
     EVENTS_TABLE_SQL,
     EVENTS_WITH_PROPS_TABLE_SQL,
 )
+from ee.clickhouse.sql.events_retention import (
+    DROP_EVENTS_RETENTION_TABLE_MV_SQL,
+    DROP_EVENTS_RETENTION_TABLE_SQL,
+    EVENTS_RETENTION_TABLE_MV_SQL,
+    EVENTS_RETENTION_TABLE_SQL,
+)
 from ee.clickhouse.sql.person import (
     DROP_PERSON_DISTINCT_ID_TABLE_SQL,
     DROP_PERSON_STATIC_COHORT_TABLE_SQL,
@@ -28,6 +34,7 @@ from ee.clickhouse.sql.session_recording_events import (
 class ClickhouseTestMixin:
     def tearDown(self):
         try:
+            self._destroy_events_retention_tables()
             self._destroy_event_tables()
             self._destroy_person_tables()
             self._destroy_session_recording_tables()
@@ -38,6 +45,7 @@ class ClickhouseTestMixin:
 
         try:
             self._create_event_tables()
+            self._create_events_retention_tables()
             self._create_person_tables()
             self._create_session_recording_tables()
             self._create_cohortpeople_table()
@@ -69,6 +77,15 @@ class ClickhouseTestMixin:
         sync_execute(EVENTS_TABLE_SQL)
         sync_execute(EVENTS_WITH_PROPS_TABLE_SQL)
 
+    def _destroy_events_retention_tables(self):
+        sync_execute(DROP_EVENTS_RETENTION_TABLE_MV_SQL)
+        sync_execute(DROP_EVENTS_RETENTION_TABLE_SQL)
+
+    def _create_events_retention_tables(self):
+        # Recreated after the events table so the materialized view picks up inserts into the new table
+        sync_execute(EVENTS_RETENTION_TABLE_SQL)
+        sync_execute(EVENTS_RETENTION_TABLE_MV_SQL)
+
     def _destroy_cohortpeople_table(self):
         sync_execute(DROP_COHORTPEOPLE_TABLE_SQL)
 
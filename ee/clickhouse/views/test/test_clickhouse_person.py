@@ -23,4 +23,12 @@ def _create_person(**kwargs):
 class ClickhouseTestPersonApi(
     ClickhouseTestMixin, factory_test_person(_create_event, _create_person, _get_events, Person.objects.all)  # type: ignore
 ):
-    pass
+    def test_delete_person_clears_events_retention(self):
+        person = _create_person(team=self.team, distinct_ids=["person_1", "anonymous_id"])
+        _create_event(event="test", team=self.team, distinct_id="person_1")
+        _create_event(event="test", team=self.team, distinct_id="anonymous_id")
+        _create_event(event="test", team=self.team, distinct_id="someone_else")
+
+        response = self.client.delete(f"/api/person/{person.pk}/")
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(sync_execute("SELECT distinct_id FROM events_retention"), [("someone_else",)])
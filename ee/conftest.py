@@ -53,6 +53,12 @@ def db(db):
         EVENTS_TABLE_SQL,
         EVENTS_WITH_PROPS_TABLE_SQL,
     )
+    from ee.clickhouse.sql.events_retention import (
+        DROP_EVENTS_RETENTION_TABLE_MV_SQL,
+        DROP_EVENTS_RETENTION_TABLE_SQL,
+        EVENTS_RETENTION_TABLE_MV_SQL,
+        EVENTS_RETENTION_TABLE_SQL,
+    )
     from ee.clickhouse.sql.person import (
         DROP_PERSON_DISTINCT_ID_TABLE_SQL,
         DROP_PERSON_STATIC_COHORT_TABLE_SQL,
@@ -69,6 +75,8 @@ def db(db):
     yield
 
     try:
+        sync_execute(DROP_EVENTS_RETENTION_TABLE_MV_SQL)
+        sync_execute(DROP_EVENTS_RETENTION_TABLE_SQL)
         sync_execute(DROP_EVENTS_TABLE_SQL)
         sync_execute(DROP_EVENTS_WITH_ARRAY_PROPS_TABLE_SQL)
         sync_execute(DROP_PERSON_TABLE_SQL)
@@ -79,6 +87,8 @@ def db(db):
 
         sync_execute(EVENTS_TABLE_SQL)
         sync_execute(EVENTS_WITH_PROPS_TABLE_SQL)
+        sync_execute(EVENTS_RETENTION_TABLE_SQL)
+        sync_execute(EVENTS_RETENTION_TABLE_MV_SQL)
         sync_execute(SESSION_RECORDING_EVENTS_TABLE_SQL)
         sync_execute(PERSONS_TABLE_SQL)
         sync_execute(PERSONS_DISTINCT_ID_TABLE_SQL)
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+from django.utils.timezone import now
+
+from ee.clickhouse.client import sync_execute
+from ee.clickhouse.sql.events_retention import EVENTS_RETENTION_BACKFILL_SQL
+
+
+# ex: python manage.py backfill_events_retention --before "2021-06-01 00:00:00"
+class Command(BaseCommand):
+    help = "Backfill events_retention with events inserted before its materialized view was created"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--before",
+            type=str,
+            help="Only backfill events before this UTC timestamp. Defaults to now, overlapping with rows the "
+            "materialized view already wrote is harmless as they're merged with min.",
+        )
+
+    def handle(self, *args, **options):
+        before = options["before"] or now().strftime("%Y-%m-%d %H:%M:%S")
+        sync_execute(EVENTS_RETENTION_BACKFILL_SQL, {"before": before})
+        print(f"Backfilled events_retention with events before {before}")
@@ -1,14 +1,16 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 from enum import Enum
 from functools import wraps
 from typing import Callable, Dict, List, Union, cast
 
+from dateutil.relativedelta import relativedelta
 from django.core.cache import cache
 from django.utils.timezone import now
 from rest_framework.request import Request
 
 from posthog.models import Filter, Team, User
 from posthog.models.dashboard_item import DashboardItem
+from posthog.models.filters.retention_filter import RetentionFilter
 from posthog.models.filters.utils import get_filter
 from posthog.settings import TEMP_CACHE_RESULTS_TTL
 from posthog.utils import should_refresh
@@ -49,7 +51,7 @@ def cached_function():
             # cache new data
             if result is not None and not (isinstance(result.get("result"), dict) and result["result"].get("loading")):
                 cache.set(
-                    cache_key, {"result": result["result"], "last_refresh": now()}, TEMP_CACHE_RESULTS_TTL,
+                    cache_key, {"result": result["result"], "last_refresh": now()}, get_cache_ttl(filter),
                 )
                 if filter:
                     dashboard_items = DashboardItem.objects.filter(team_id=team.pk, filters_hash=cache_key)
@@ -59,3 +61,24 @@ def cached_function():
         return wrapper
 
     return parameterized_decorator
+
+
+def get_cache_ttl(filter, ttl: int = TEMP_CACHE_RESULTS_TTL) -> int:
+    # Retention results are bucketed by period, expire them when the current period closes so the new bucket shows up
+    if isinstance(filter, RetentionFilter):
+        return min(ttl, seconds_until_next_period(filter.period, now()))
+    return ttl
+
+
+def seconds_until_next_period(period: str, current: datetime) -> int:
+    start_of_day = current.replace(hour=0, minute=0, second=0, microsecond=0)
+    if period == "Hour":
+        next_period = current.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+    elif period == "Week":
+        # Retention weeks start on Sunday, see RetentionDateDerivedMixin.date_from
+        next_period = start_of_day - timedelta(days=current.isoweekday() % 7) + timedelta(weeks=1)
+    elif period == "Month":
+        next_period = start_of_day.replace(day=1) + relativedelta(months=1)
+    else:
+        next_period = start_of_day + timedelta(days=1)
+    return max(1, int((next_period - current).total_seconds()))
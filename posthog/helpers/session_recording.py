@@ -2,8 +2,9 @@ import base64
 import gzip
 import json
 from collections import defaultdict
-from typing import Dict, Generator, List
+from typing import Dict, Generator, Iterable, List
 
+import orjson
 from sentry_sdk.api import capture_exception, capture_message
 
 from posthog.models import utils
@@ -58,26 +59,44 @@ def compress_and_chunk_snapshots(events: List[Event], chunk_size=512 * 1024) ->
 
 
 def decompress_chunked_snapshot_data(
-    team_id: int, session_recording_id: str, snapshot_list: List[SnapshotData]
+    team_id: int, session_recording_id: str, snapshot_list: Iterable[SnapshotData]
 ) -> Generator[SnapshotData, None, None]:
-    chunks_collector = defaultdict(list)
+    # Chunk groups are merged as soon as they're complete, so only groups still being filled are kept around
+    chunks_collector: Dict[str, List[SnapshotData]] = defaultdict(list)
     for snapshot_data in snapshot_list:
         if "chunk_id" not in snapshot_data:
             yield snapshot_data
-        else:
-            chunks_collector[snapshot_data["chunk_id"]].append(snapshot_data)
-
-    for chunks in chunks_collector.values():
-        if len(chunks) != chunks[0]["chunk_count"]:
-            capture_message(
-                "Did not find all session recording chunks! Team: {}, Session: {}".format(team_id, session_recording_id)
-            )
             continue
 
-        b64_compressed_data = "".join(chunk["data"] for chunk in sorted(chunks, key=lambda c: c["chunk_index"]))
-        decompressed_data = json.loads(decompress(b64_compressed_data))
+        chunk_id = snapshot_data["chunk_id"]
+        chunks = chunks_collector[chunk_id]
+        chunks.append(snapshot_data)
+        if len(chunks) == chunks[0]["chunk_count"]:
+            del chunks_collector[chunk_id]
+            yield from merge_snapshot_chunks(team_id, session_recording_id, chunks)
+
+    for _ in chunks_collector.values():
+        capture_message(
+            "Did not find all session recording chunks! Team: {}, Session: {}".format(team_id, session_recording_id)
+        )
+
+
+def merge_snapshot_chunks(
+    team_id: int, session_recording_id: str, chunks: List[SnapshotData]
+) -> Generator[SnapshotData, None, None]:
+    # Chunked events can come straight from clients, so indexes can't be trusted to be in range or unique
+    if {chunk["chunk_index"] for chunk in chunks} != set(range(len(chunks))):
+        capture_message(
+            "Invalid session recording chunk indexes! Team: {}, Session: {}".format(team_id, session_recording_id)
+        )
+        return
+
+    parts = [""] * len(chunks)
+    for chunk in chunks:
+        parts[chunk["chunk_index"]] = chunk["data"]
 
-        yield from decompressed_data
+    b64_compressed_data = "".join(parts)
+    yield from loads_snapshot_data(decompress(b64_compressed_data))
 
 
 def chunk_string(string: str, chunk_length: int) -> List[str]:
@@ -102,6 +121,14 @@ def compress_to_string(json_string: str) -> str:
     return base64.b64encode(compressed_data).decode("utf-8")
 
 
+def loads_snapshot_data(json_string: str) -> List[SnapshotData]:
+    try:
+        return orjson.loads(json_string)
+    except orjson.JSONDecodeError:
+        # orjson rejects lone surrogates, which recordings can contain (see surrogatepass above)
+        return json.loads(json_string)
+
+
 def decompress(base64data: str) -> str:
     compressed_bytes = base64.b64decode(base64data)
     return gzip.decompress(compressed_bytes).decode("utf-16", "surrogatepass")
@@ -79,6 +79,14 @@ def test_decompression_results_in_same_data(snapshot_events):
     ]
 
 
+def test_decompression_with_lone_surrogates(snapshot_events):
+    snapshot_events[1]["properties"]["$snapshot_data"]["foo"] = "\ud83d"
+    assert compress_and_decompress(snapshot_events, 100) == [
+        snapshot_events[0]["properties"]["$snapshot_data"],
+        snapshot_events[1]["properties"]["$snapshot_data"],
+    ]
+
+
 def test_has_full_snapshot_property(snapshot_events):
     compressed = list(compress_and_chunk_snapshots(snapshot_events))
     assert len(compressed) == 1
@@ -115,6 +123,42 @@ def test_decompress_ignores_if_not_enough_chunks(snapshot_events):
     assert list(decompress_chunked_snapshot_data(1, "someid", snapshot_data)) == complete_snapshots
 
 
+def test_decompress_ignores_invalid_chunk_indexes(snapshot_events):
+    chunks = [
+        event["properties"]["$snapshot_data"] for event in compress_and_chunk_snapshots(snapshot_events, chunk_size=10)
+    ]
+    assert len(chunks) > 2
+
+    out_of_range = [*chunks[:-1], {**chunks[-1], "chunk_index": len(chunks)}]
+    assert list(decompress_chunked_snapshot_data(1, "someid", out_of_range)) == []
+
+    duplicated = [*chunks[:-1], {**chunks[-1], "chunk_index": 0}]
+    assert list(decompress_chunked_snapshot_data(1, "someid", duplicated)) == []
+
+
+def test_decompress_merges_interleaved_chunk_groups_as_they_complete(snapshot_events):
+    first_chunks = [
+        event["properties"]["$snapshot_data"] for event in compress_and_chunk_snapshots(snapshot_events[:1], 20)
+    ]
+    second_chunks = [
+        event["properties"]["$snapshot_data"] for event in compress_and_chunk_snapshots(snapshot_events[1:], 20)
+    ]
+    unchunked = {"type": 3, "foo": "unchunked"}
+
+    snapshot_data = [
+        first_chunks[0],
+        *second_chunks,
+        unchunked,
+        *first_chunks[1:],
+    ]
+
+    assert list(decompress_chunked_snapshot_data(1, "someid", snapshot_data)) == [
+        snapshot_events[1]["properties"]["$snapshot_data"],
+        unchunked,
+        snapshot_events[0]["properties"]["$snapshot_data"],
+    ]
+
+
 @pytest.fixture
 def snapshot_events():
     return [
@@ -0,0 +1,18 @@
+# Generated by Django 3.1.12 on 2021-06-25 10:12
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("posthog", "0158_new_token_format"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS posthog_sessionrecordingevent_team_session_ts ON posthog_sessionrecordingevent(team_id, session_id, timestamp);",
+            reverse_sql='DROP INDEX "posthog_sessionrecordingevent_team_session_ts";',
+        )
+    ]
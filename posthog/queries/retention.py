@@ -22,17 +22,25 @@ class Retention(BaseQuery):
     def process_table_result(
         self, resultset: Dict[Tuple[int, int], Dict[str, Any]], filter: RetentionFilter,
     ):
+        total_intervals = filter.total_intervals
+        period_increment = filter.period_increment
+
+        # Pivot the sparse resultset into a dense triangular grid in one pass over the rows
+        grid: List[List[Dict[str, Any]]] = [
+            [{"count": 0, "people": []} for _ in range(total_intervals - first_day)]
+            for first_day in range(total_intervals)
+        ]
+        for (first_day, day), value in resultset.items():
+            if 0 <= first_day < total_intervals and 0 <= day < total_intervals - first_day:
+                grid[first_day][day] = value
 
         result = [
             {
-                "values": [
-                    resultset.get((first_day, day), {"count": 0, "people": []})
-                    for day in range(filter.total_intervals - first_day)
-                ],
+                "values": grid[first_day],
                 "label": "{} {}".format(filter.period, first_day),
-                "date": (filter.date_from + RetentionFilter.determine_time_delta(first_day, filter.period)[0]),
+                "date": filter.date_from + first_day * period_increment,
             }
-            for first_day in range(filter.total_intervals)
+            for first_day in range(total_intervals)
         ]
 
         return result
@@ -1,9 +1,12 @@
 import datetime
+from collections import defaultdict
+from itertools import chain
 from typing import (
     Any,
     Callable,
     Dict,
     Generator,
+    Iterator,
     List,
     Optional,
     Set,
@@ -19,33 +22,28 @@ from posthog.models.session_recording_event import SessionRecordingViewed
 from posthog.models.utils import namedtuplefetchall
 
 DistinctId = str
-Snapshots = List[Any]
+Snapshots = Iterator[Any]
 
 
+SNAPSHOTS_CHUNK_SIZE = 2000
+
 OPERATORS = {"gt": ">", "lt": "<"}
 SESSIONS_IN_RANGE_QUERY = """
     SELECT
         session_id,
         distinct_id,
-        start_time,
-        end_time,
-        end_time - start_time as duration
-    FROM (
-        SELECT
-            session_id,
-            distinct_id,
-            MIN(timestamp) as start_time,
-            MAX(timestamp) as end_time,
-            MAX(timestamp) - MIN(timestamp) as duration,
-            COUNT(*) FILTER(where snapshot_data->>'type' = '2' OR (snapshot_data->>'has_full_snapshot')::boolean) as full_snapshots
-        FROM posthog_sessionrecordingevent
-        WHERE
-            team_id = %(team_id)s
-            AND timestamp >= %(start_time)s
-            AND timestamp <= %(end_time)s
-        GROUP BY distinct_id, session_id
-    ) AS p
-    WHERE full_snapshots > 0 {filter_query}
+        MIN(timestamp) as start_time,
+        MAX(timestamp) as end_time,
+        MAX(timestamp) - MIN(timestamp) as duration
+    FROM posthog_sessionrecordingevent
+    WHERE
+        team_id = %(team_id)s
+        AND timestamp >= %(start_time)s
+        AND timestamp <= %(end_time)s
+    GROUP BY distinct_id, session_id
+    HAVING
+        COUNT(*) FILTER(where snapshot_data->>'type' = '2' OR (snapshot_data->>'has_full_snapshot')::boolean) > 0
+        {having_filter}
 """
 
 
@@ -53,18 +51,28 @@ class SessionRecording:
     def query_recording_snapshots(
         self, team: Team, session_id: str
     ) -> Tuple[Optional[DistinctId], Optional[datetime.datetime], Snapshots]:
-        events = SessionRecordingEvent.objects.filter(team=team, session_id=session_id).order_by("timestamp")
+        # `.iterator()` fetches rows from a server-side cursor (unless DISABLE_SERVER_SIDE_CURSORS is set) in batches
+        # of SNAPSHOTS_CHUNK_SIZE, instead of loading every model instance up front
+        events = (
+            SessionRecordingEvent.objects.filter(team=team, session_id=session_id)
+            .order_by("timestamp")
+            .values_list("distinct_id", "timestamp", "snapshot_data")
+            .iterator(chunk_size=SNAPSHOTS_CHUNK_SIZE)
+        )
 
-        if len(events) == 0:
-            return None, None, []
+        try:
+            distinct_id, start_time, snapshot_data = next(events)
+        except StopIteration:
+            return None, None, iter([])
 
-        return events[0].distinct_id, events[0].timestamp, [e.snapshot_data for e in events]
+        # Snapshots are consumed lazily while merging chunks, so the full recording is never held in a list
+        return distinct_id, start_time, chain([snapshot_data], (snapshot_data for _, _, snapshot_data in events))
 
     def run(self, team: Team, session_recording_id: str, *args, **kwargs) -> Dict[str, Any]:
         from posthog.api.person import PersonSerializer
 
-        distinct_id, start_time, snapshots = self.query_recording_snapshots(team, session_recording_id)
-        snapshots = list(decompress_chunked_snapshot_data(team.pk, session_recording_id, snapshots))
+        distinct_id, start_time, unmerged_snapshots = self.query_recording_snapshots(team, session_recording_id)
+        snapshots = list(decompress_chunked_snapshot_data(team.pk, session_recording_id, unmerged_snapshots))
 
         person = (
             PersonSerializer(Person.objects.get(team=team, persondistinctid__distinct_id=distinct_id)).data
@@ -82,17 +90,17 @@ class SessionRecording:
 def query_sessions_in_range(
     team: Team, start_time: datetime.datetime, end_time: datetime.datetime, filter: SessionsFilter
 ) -> List[dict]:
-    filter_query, filter_params = "", {}
+    having_filter, filter_params = "", {}
 
     if filter.recording_duration_filter:
-        filter_query = f"AND duration {OPERATORS[filter.recording_duration_filter.operator]} INTERVAL '%(min_recording_duration)s seconds'"
+        having_filter = f"AND MAX(timestamp) - MIN(timestamp) {OPERATORS[filter.recording_duration_filter.operator]} INTERVAL '%(min_recording_duration)s seconds'"
         filter_params = {
             "min_recording_duration": filter.recording_duration_filter.value,
         }
 
     with connection.cursor() as cursor:
         cursor.execute(
-            SESSIONS_IN_RANGE_QUERY.format(filter_query=filter_query),
+            SESSIONS_IN_RANGE_QUERY.format(having_filter=having_filter),
             {"team_id": team.id, "start_time": start_time, "end_time": end_time, **filter_params,},
         )
 
@@ -108,46 +116,71 @@ def filter_sessions_by_recordings(
     if len(sessions_results) == 0:
         return sessions_results
 
-    min_ts = min(it["start_time"] for it in sessions_results)
-    max_ts = max(it["end_time"] for it in sessions_results)
+    min_ts, max_ts = sessions_results[0]["start_time"], sessions_results[0]["end_time"]
+    for session in sessions_results:
+        if session["start_time"] < min_ts:
+            min_ts = session["start_time"]
+        if session["end_time"] > max_ts:
+            max_ts = session["end_time"]
 
     session_recordings = query(team, min_ts, max_ts, filter)
     viewed_session_recordings = set(
-        SessionRecordingViewed.objects.filter(team=team, user_id=filter.user_id).values_list("session_id", flat=True)
+        SessionRecordingViewed.objects.filter(
+            team=team,
+            user_id=filter.user_id,
+            session_id__in=[recording["session_id"] for recording in session_recordings],
+        ).values_list("session_id", flat=True)
     )
 
+    if filter.recording_unseen_filter:
+        session_recordings = [
+            recording for recording in session_recordings if recording["session_id"] not in viewed_session_recordings
+        ]
+
+    recordings_by_distinct_id = group_recordings_by_distinct_id(session_recordings)
+
+    matching_sessions = []
     for session in sessions_results:
         session["session_recordings"] = list(
-            collect_matching_recordings(session, session_recordings, filter, viewed_session_recordings)
+            collect_matching_recordings(
+                session, recordings_by_distinct_id.get(session["distinct_id"], []), viewed_session_recordings
+            )
         )
+        if session["session_recordings"] or not filter.limit_by_recordings:
+            matching_sessions.append(session)
 
-    if filter.limit_by_recordings:
-        sessions_results = [session for session in sessions_results if len(session["session_recordings"]) > 0]
-    return sessions_results
+    return matching_sessions
+
+
+def group_recordings_by_distinct_id(session_recordings: List[Any]) -> Dict[DistinctId, List[Any]]:
+    recordings_by_distinct_id: Dict[DistinctId, List[Any]] = defaultdict(list)
+    for recording in session_recordings:
+        recordings_by_distinct_id[recording["distinct_id"]].append(recording)
+    for recordings in recordings_by_distinct_id.values():
+        recordings.sort(key=lambda recording: recording["start_time"])
+    return recordings_by_distinct_id
 
 
 def collect_matching_recordings(
-    session: Any, session_recordings: List[Any], filter: SessionsFilter, viewed: Set[str]
+    session: Any, session_recordings: List[Any], viewed: Set[str]
 ) -> Generator[Dict, None, None]:
+    """Expects `session_recordings` to belong to the session's distinct_id and be sorted by start_time,
+    see `group_recordings_by_distinct_id`."""
+    session_start, session_end = session["start_time"], session["end_time"]
     for recording in session_recordings:
-        if matches(session, recording, filter, viewed):
+        if recording["start_time"] > session_end:
+            break
+        if recording["end_time"] >= session_start:
             if isinstance(recording["duration"], datetime.timedelta):
                 # postgres
                 recording_duration = recording["duration"].total_seconds()
             else:
                 # clickhouse
                 recording_duration = recording["duration"]
+            session_id = recording["session_id"]
             yield {
-                "id": recording["session_id"],
+                "id": session_id,
                 "recording_duration": recording_duration or 0,
-                "viewed": recording["session_id"] in viewed,
+                "viewed": session_id in viewed,
             }
 
-
-def matches(session: Any, session_recording: Any, filter: SessionsFilter, viewed: Set[str]) -> bool:
-    return (
-        session["distinct_id"] == session_recording["distinct_id"]
-        and session["start_time"] <= session_recording["end_time"]
-        and session["end_time"] >= session_recording["start_time"]
-        and (not filter.recording_unseen_filter or session_recording["session_id"] not in viewed)
-    )
@@ -22,7 +22,7 @@ from posthog.constants import (
     TRENDS_LINEAR,
     TRENDS_STICKINESS,
 )
-from posthog.decorators import CacheType
+from posthog.decorators import CacheType, get_cache_ttl
 from posthog.ee import is_clickhouse_enabled
 from posthog.models import Dashboard, DashboardItem, Filter, Team
 from posthog.models.filters.stickiness_filter import StickinessFilter
@@ -64,7 +64,11 @@ def update_cache_item(key: str, cache_type: CacheType, payload: dict) -> None:
         result = _calculate_by_filter(filter, key, team_id, cache_type)
 
     if result:
-        cache.set(key, {"result": result, "type": cache_type, "last_refresh": timezone.now()}, CACHED_RESULTS_TTL)
+        cache.set(
+            key,
+            {"result": result, "type": cache_type, "last_refresh": timezone.now()},
+            get_cache_ttl(filter, CACHED_RESULTS_TTL),
+        )
 
 
 def update_dashboard_items_cache(dashboard: Dashboard) -> None:
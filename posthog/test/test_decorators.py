@@ -0,0 +1,40 @@
+from datetime import datetime
+
+import pytz
+from django.test import TestCase
+from freezegun import freeze_time
+
+from posthog.decorators import get_cache_ttl, seconds_until_next_period
+from posthog.models import Filter
+from posthog.models.filters import RetentionFilter
+from posthog.settings import CACHED_RESULTS_TTL, TEMP_CACHE_RESULTS_TTL
+
+
+class TestCacheTTL(TestCase):
+    def test_seconds_until_next_period(self):
+        current = datetime(2020, 1, 29, 12, 22, 23, tzinfo=pytz.UTC)  # a Wednesday
+
+        self.assertEqual(seconds_until_next_period("Hour", current), 37 * 60 + 37)
+        self.assertEqual(seconds_until_next_period("Day", current), 11 * 60 * 60 + 37 * 60 + 37)
+        self.assertEqual(seconds_until_next_period("Week", current), (3 * 24 + 11) * 60 * 60 + 37 * 60 + 37)
+        self.assertEqual(seconds_until_next_period("Month", current), (2 * 24 + 11) * 60 * 60 + 37 * 60 + 37)
+
+    def test_seconds_until_next_period_at_boundary(self):
+        current = datetime(2020, 2, 2, 0, 0, 0, tzinfo=pytz.UTC)  # a Sunday
+
+        self.assertEqual(seconds_until_next_period("Day", current), 24 * 60 * 60)
+        self.assertEqual(seconds_until_next_period("Week", current), 7 * 24 * 60 * 60)
+
+    @freeze_time("2020-01-29T23:30:00Z")
+    def test_get_cache_ttl_caps_retention_filter(self):
+        filter = RetentionFilter(data={"period": "Day"})
+
+        self.assertEqual(get_cache_ttl(filter), 30 * 60)
+        self.assertEqual(get_cache_ttl(filter, CACHED_RESULTS_TTL), 30 * 60)
+
+    @freeze_time("2020-01-29T23:30:00Z")
+    def test_get_cache_ttl_keeps_ttl_for_other_filters(self):
+        filter = Filter(data={"interval": "day"})
+
+        self.assertEqual(get_cache_ttl(filter), TEMP_CACHE_RESULTS_TTL)
+        self.assertEqual(get_cache_ttl(filter, CACHED_RESULTS_TTL), CACHED_RESULTS_TTL)